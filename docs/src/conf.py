@@ -1,11 +1,11 @@
+import glob
 import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-import toml
-
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
@@ -22,34 +22,86 @@ copyright = f"{datetime.now().date().year}, {author}"
 
 
 def load_version_from_cargo_toml():
+    # read the version from Cargo.toml, without requiring a full TOML parser. The
+    # first `version` in the file is the one in the `[package]` section.
     with open(os.path.join(ROOT, "featomic", "Cargo.toml")) as fd:
-        data = toml.load(fd)
-    return data["package"]["version"]
+        for line in fd:
+            if line.startswith("version"):
+                _, version = line.split("=")
+                return version.strip().strip('"')
+
+    raise RuntimeError("could not find the version of featomic in Cargo.toml")
 
 
 # The full version, including alpha/beta/rc tags
 release = load_version_from_cargo_toml()
 
 
+def needs_rebuild(stamp, inputs, outputs):
+    """
+    Check if any file matching the ``inputs`` glob patterns (relative to the root of
+    the repository) was modified since the ``stamp`` file was created, or if any of
+    the ``outputs`` paths (also relative to the root of the repository) is missing.
+    """
+    for output in outputs:
+        if not os.path.exists(os.path.join(ROOT, output)):
+            return True
+
+    stamp = os.path.join(ROOT, "docs", "build", "stamps", stamp)
+    if not os.path.exists(stamp):
+        return True
+
+    stamp_mtime = os.path.getmtime(stamp)
+    for pattern in inputs:
+        for path in glob.iglob(os.path.join(ROOT, pattern), recursive=True):
+            if os.path.getmtime(path) > stamp_mtime:
+                return True
+
+    return False
+
+
+def touch_stamp(stamp):
+    """Record that the step corresponding to ``stamp`` was successfully executed"""
+    stamp = os.path.join(ROOT, "docs", "build", "stamps", stamp)
+    os.makedirs(os.path.dirname(stamp), exist_ok=True)
+    with open(stamp, "w"):
+        pass
+
+
 def build_cargo_docs():
-    environment = {name: value for name, value in os.environ.items()}
-
-    # include KaTeX in the page to render math in the docs
-    katex_html = os.path.join(ROOT, "docs", "inject-katex.html")
-    environment["RUSTDOCFLAGS"] = f"--html-in-header={katex_html}"
-
-    subprocess.run(
-        [
-            "cargo",
-            "doc",
-            "--package",
-            "featomic",
-            "--package",
-            "metatensor",
-            "--no-deps",
-        ],
-        env=environment,
-    )
+    inputs = [
+        "Cargo.lock",
+        "featomic/Cargo.toml",
+        "featomic/src/**",
+        "docs/inject-katex.html",
+    ]
+    # `cargo clean` removes the output without touching the stamp
+    outputs = ["target/doc/featomic/index.html"]
+    if needs_rebuild("cargo-doc", inputs, outputs):
+        environment = {name: value for name, value in os.environ.items()}
+
+        # include KaTeX in the page to render math in the docs
+        katex_html = os.path.join(ROOT, "docs", "inject-katex.html")
+        environment["RUSTDOCFLAGS"] = f"--html-in-header={katex_html}"
+
+        result = subprocess.run(
+            [
+                "cargo",
+                "doc",
+                "--package",
+                "featomic",
+                "--package",
+                "metatensor",
+                "--no-deps",
+            ],
+            env=environment,
+        )
+
+        if result.returncode == 0:
+            touch_stamp("cargo-doc")
+
+    # always sync the output, since the sphinx output directory could have been removed
+    # without removing the stamps. This only copies the files that changed.
     output_dir = os.path.join(
         ROOT,
         "docs",
@@ -59,27 +111,96 @@ def build_cargo_docs():
         "api",
         "rust",
     )
-    if os.path.exists(output_dir):
-        shutil.rmtree(output_dir)
-    shutil.copytree(
-        os.path.join(ROOT, "target", "doc"),
-        output_dir,
-    )
+    cargo_doc_dir = os.path.join(ROOT, "target", "doc")
+    if not os.path.exists(os.path.join(ROOT, outputs[0])):
+        raise RuntimeError(
+            f"missing Rust API documentation in '{cargo_doc_dir}', "
+            "`cargo doc` probably failed"
+        )
+    sync_directory(cargo_doc_dir, output_dir)
+
+
+def sync_directory(source, destination):
+    """
+    Make ``destination`` a copy of ``source``, only copying the files that changed
+    since the last sync, and removing files that are no longer in ``source``.
+    """
+    os.makedirs(destination, exist_ok=True)
+
+    source_entries = {entry.name: entry for entry in os.scandir(source)}
+    for entry in os.scandir(destination):
+        source_entry = source_entries.get(entry.name)
+        if source_entry is None or source_entry.is_dir() != entry.is_dir():
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
+    for name, entry in source_entries.items():
+        output = os.path.join(destination, name)
+        if entry.is_dir():
+            sync_directory(entry.path, output)
+        else:
+            stat = entry.stat()
+            if os.path.exists(output):
+                output_stat = os.stat(output)
+                if (
+                    output_stat.st_size == stat.st_size
+                    and output_stat.st_mtime == stat.st_mtime
+                ):
+                    continue
+            # copy2 keeps the modification time, which we use to find changed files
+            shutil.copy2(entry.path, output)
 
 
 def extract_json_schema():
-    subprocess.run(["cargo", "run", "--package", "featomic-json-schema"])
+    inputs = [
+        "Cargo.lock",
+        "featomic/Cargo.toml",
+        "featomic/src/**",
+        "docs/featomic-json-schema/**",
+    ]
+    outputs = ["docs/build/json-schemas"]
+    if not needs_rebuild("json-schema", inputs, outputs):
+        return
+
+    result = subprocess.run(["cargo", "run", "--package", "featomic-json-schema"])
+    if result.returncode == 0:
+        touch_stamp("json-schema")
 
 
 def build_doxygen_docs():
+    inputs = [
+        "featomic-c-api/Cargo.toml",
+        "featomic-c-api/build.rs",
+        "featomic-c-api/src/**",
+        "featomic-c-api/include/**",
+        "featomic-torch/include/**",
+        "docs/Doxyfile",
+    ]
+    outputs = ["docs/build/doxygen/xml/index.xml"]
+    if not needs_rebuild("doxygen", inputs, outputs):
+        return
+
     # we need to run a build to make sure the header is up to date
-    subprocess.run(["cargo", "build", "--package", "featomic-c-api"])
-    subprocess.run(["doxygen", "Doxyfile"], cwd=os.path.join(ROOT, "docs"))
+    cargo = subprocess.run(["cargo", "build", "--package", "featomic-c-api"])
+    doxygen = subprocess.run(["doxygen", "Doxyfile"], cwd=os.path.join(ROOT, "docs"))
+
+    if cargo.returncode == 0 and doxygen.returncode == 0:
+        touch_stamp("doxygen")
 
 
-extract_json_schema()
-build_cargo_docs()
-build_doxygen_docs()
+# These steps are independent from one another, so we run them concurrently. The
+# cargo commands will still wait on each other (cargo locks the target directory), but
+# doxygen can run at the same time as cargo.
+with ThreadPoolExecutor() as executor:
+    futures = [
+        executor.submit(extract_json_schema),
+        executor.submit(build_cargo_docs),
+        executor.submit(build_doxygen_docs),
+    ]
+    for future in futures:
+        future.result()
 
 
 def setup(app):
@@ -145,7 +266,6 @@ intersphinx_mapping = {
     "matplotlib": ("https://matplotlib.org/stable/", None),
     "numpy": ("https://numpy.org/doc/stable/", None),
     "scipy": ("https://docs.scipy.org/doc/scipy/", None),
-    "skmatter": ("https://scikit-matter.readthedocs.io/en/latest/", None),
     "torch": ("https://pytorch.org/docs/stable/", None),
     "python": ("https://docs.python.org/3", None),
 }
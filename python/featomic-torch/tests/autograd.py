@@ -40,6 +40,19 @@ def _create_random_system(n_atoms, cell_size):
     return types, positions, cell, pbc
 
 
+@pytest.fixture(scope="module")
+def shared_system():
+    # gradcheck runs one calculation for each input, so we use a small system. The
+    # periodic images still give each atom many neighbors within the cutoff.
+    return _create_random_system(n_atoms=12, cell_size=5.0)
+
+
+@pytest.fixture
+def system(shared_system):
+    # tests modify `requires_grad` on these tensors, so each test gets its own copy
+    return tuple(tensor.clone() for tensor in shared_system)
+
+
 def _compute_spherical_expansion(types, positions, cell, pbc):
     system = System(types=types, positions=positions, cell=cell, pbc=pbc)
 
@@ -65,8 +78,8 @@ def _compute_power_spectrum(types, positions, cell, pbc):
     return descriptor.block(0).values
 
 
-def test_spherical_expansion_positions_grad():
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+def test_spherical_expansion_positions_grad(system):
+    types, positions, cell, pbc = system
     positions.requires_grad = True
 
     assert torch.autograd.gradcheck(
@@ -76,8 +89,8 @@ def test_spherical_expansion_positions_grad():
     )
 
 
-def test_spherical_expansion_cell_grad():
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+def test_spherical_expansion_cell_grad(system):
+    types, positions, cell, pbc = system
     cell.requires_grad = True
 
     assert torch.autograd.gradcheck(
@@ -87,8 +100,8 @@ def test_spherical_expansion_cell_grad():
     )
 
 
-def test_power_spectrum_positions_grad():
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+def test_power_spectrum_positions_grad(system):
+    types, positions, cell, pbc = system
     positions.requires_grad = True
 
     assert torch.autograd.gradcheck(
@@ -98,8 +111,8 @@ def test_power_spectrum_positions_grad():
     )
 
 
-def test_power_spectrum_cell_grad():
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+def test_power_spectrum_cell_grad(system):
+    types, positions, cell, pbc = system
     cell.requires_grad = True
 
     assert torch.autograd.gradcheck(
@@ -109,9 +122,9 @@ def test_power_spectrum_cell_grad():
     )
 
 
-def test_power_spectrum_register_autograd():
+def test_power_spectrum_register_autograd(system):
     # check autograd when registering the graph after pre-computing a representation
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+    types, positions, cell, pbc = system
 
     calculator = SoapPowerSpectrum(**HYPERS)
     precomputed = calculator(
@@ -153,8 +166,8 @@ def test_power_spectrum_register_autograd():
     )
 
 
-def test_power_spectrum_positions_grad_grad():
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+def test_power_spectrum_positions_grad_grad(system):
+    types, positions, cell, pbc = system
     positions.requires_grad = True
 
     X = _compute_power_spectrum(types, positions, cell, pbc)
@@ -191,8 +204,8 @@ def test_power_spectrum_positions_grad_grad():
         )
 
 
-def test_power_spectrum_cell_grad_grad():
-    types, positions, cell, pbc = _create_random_system(n_atoms=75, cell_size=5.0)
+def test_power_spectrum_cell_grad_grad(system):
+    types, positions, cell, pbc = system
     cell.requires_grad = True
 
     X = _compute_power_spectrum(types, positions, cell, pbc)
@@ -251,18 +264,21 @@ def test_different_device_dtype():
     if torch.cuda.is_available():
         options.append((torch.device("cuda:0"), torch.float64))
 
+    types_cpu, positions_cpu, cell_cpu, pbc_cpu = _create_random_system(
+        n_atoms=10, cell_size=3.0
+    )
+
     for device, dtype in options:
-        types, positions, cell, pbc = _create_random_system(n_atoms=10, cell_size=3.0)
-        positions = positions.to(dtype=dtype, device=device, copy=True)
+        positions = positions_cpu.to(dtype=dtype, device=device, copy=True)
         positions.requires_grad = True
         assert positions.grad is None
 
-        cell = cell.to(dtype=dtype, device=device, copy=True)
+        cell = cell_cpu.to(dtype=dtype, device=device, copy=True)
         cell.requires_grad = True
         assert cell.grad is None
 
-        types = types.to(device=device, copy=True)
-        pbc = pbc.to(device=device, copy=True)
+        types = types_cpu.to(device=device, copy=True)
+        pbc = pbc_cpu.to(device=device, copy=True)
 
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
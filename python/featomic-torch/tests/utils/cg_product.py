@@ -99,3 +99,76 @@ def test_save_load():
         torch.jit.save(calculator, buffer)
         buffer.seek(0)
         torch.jit.load(buffer)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available")
+def test_different_device():
+    nu_1 = spherical_expansion().to(device="cuda")
+
+    # the CG coefficients are computed on CPU, and moved to the data's device
+    calculator = ClebschGordanProduct(
+        max_angular=SPHERICAL_EXPANSION_HYPERS["basis"]["max_angular"] * 2,
+        device="cpu",
+    )
+    nu_2 = calculator.compute(
+        mts.rename_dimension(nu_1, "properties", "n", "n_1"),
+        mts.rename_dimension(nu_1, "properties", "n", "n_2"),
+        o3_lambda_1_new_name="l_1",
+        o3_lambda_2_new_name="l_2",
+    )
+    assert nu_2.device.type == "cuda"
+
+
+@pytest.mark.parametrize("dtype", [torch.float16, torch.bfloat16])
+def test_half_precision(dtype):
+    nu_1 = spherical_expansion().to(dtype=torch.float64)
+    nu_1_a = mts.rename_dimension(nu_1, "properties", "n", "n_1")
+    nu_1_b = mts.rename_dimension(nu_1, "properties", "n", "n_2")
+
+    # use the same calculator for all dtypes, to check that computing with half
+    # precision does not change the results of later double precision calculations
+    calculator = ClebschGordanProduct(
+        max_angular=SPHERICAL_EXPANSION_HYPERS["basis"]["max_angular"] * 2,
+        dtype=torch.float64,
+    )
+    reference = calculator.compute(
+        nu_1_a, nu_1_b, o3_lambda_1_new_name="l_1", o3_lambda_2_new_name="l_2"
+    )
+
+    nu_2 = calculator.compute(
+        nu_1_a.to(dtype=dtype),
+        nu_1_b.to(dtype=dtype),
+        o3_lambda_1_new_name="l_1",
+        o3_lambda_2_new_name="l_2",
+    )
+    assert nu_2.block(0).values.dtype == dtype
+
+    mts.equal_metadata_raise(nu_2, reference)
+    for key, block in reference.items():
+        values = nu_2.block(key).values.to(torch.float64)
+        scale = block.values.abs().max()
+        assert torch.allclose(values, block.values, atol=3e-2 * scale, rtol=0)
+
+    nu_2 = calculator.compute(
+        nu_1_a, nu_1_b, o3_lambda_1_new_name="l_1", o3_lambda_2_new_name="l_2"
+    )
+    assert mts.equal(nu_2, reference)
+
+    # the coefficients can also be stored in half precision
+    calculator = ClebschGordanProduct(
+        max_angular=SPHERICAL_EXPANSION_HYPERS["basis"]["max_angular"] * 2,
+        dtype=dtype,
+    )
+    nu_2 = calculator.compute(
+        nu_1_a.to(dtype=dtype),
+        nu_1_b.to(dtype=dtype),
+        o3_lambda_1_new_name="l_1",
+        o3_lambda_2_new_name="l_2",
+    )
+    assert nu_2.block(0).values.dtype == dtype
+
+    mts.equal_metadata_raise(nu_2, reference)
+    for key, block in reference.items():
+        values = nu_2.block(key).values.to(torch.float64)
+        scale = block.values.abs().max()
+        assert torch.allclose(values, block.values, atol=3e-2 * scale, rtol=0)
@@ -8,7 +8,6 @@ Property Selection
 import chemfiles
 import numpy as np
 from metatensor import Labels, MetatensorError, TensorBlock, TensorMap
-from skmatter.feature_selection import FPS
 
 from featomic import SoapPowerSpectrum
 
@@ -104,10 +103,47 @@ print(
 #
 # The ``TensorMap`` format allows us to select different features within each
 # block, and then construct a general matrix of features. We can select the most
-# significant features using FPS, which selects features based on the distance
-# between them. The following code snippet selects the 10 most important
-# features in each block, then constructs a TensorMap containing this selection,
-# and calculates the final matrix of features for it.
+# significant features using farthest point sampling (FPS), which selects features
+# based on the distance between them. FPS is simple enough to implement directly with
+# numpy: we only need to keep track of the distance between every feature and the
+# closest already selected feature, and update it after each new selection. Here, we
+# also do the selection for multiple independent sets of points at once, which will
+# allow us to do the selection for all blocks together. The sets can contain different
+# numbers of points, and are padded to the same size.
+
+
+def farthest_point_sampling(points, n_points, n_to_select):
+    """
+    Select ``n_to_select`` points using farthest point sampling, starting from the
+    first point, and return the indices of the selected points. ``points`` should have
+    a shape of ``(n_sets, max_points, n_dimensions)``, and the selection is done
+    independently for each set. Only the first ``n_points[i]`` points of the set ``i``
+    are considered, the other ones are padding.
+    """
+    sets = np.arange(points.shape[0])
+    squared_norms = np.sum(points**2, axis=2)
+
+    selected = np.zeros((points.shape[0], n_to_select), dtype=np.int64)
+    min_distances = np.full(squared_norms.shape, np.inf)
+    # padding points can never be the farthest ones
+    min_distances[np.arange(points.shape[1]) >= n_points[:, None]] = -np.inf
+    for i in range(1, n_to_select):
+        # squared distance between all points and the last selected one in each set
+        last = selected[:, i - 1]
+        products = (points @ points[sets, last, :, None])[:, :, 0]
+        distances = squared_norms + squared_norms[sets, last, None] - 2 * products
+
+        min_distances = np.minimum(min_distances, distances)
+        selected[:, i] = np.argmax(min_distances, axis=1)
+
+    return selected
+
+
+# %%
+#
+# The following code snippet selects the 10 most important features in each block,
+# then constructs a TensorMap containing this selection, and calculates the final
+# matrix of features for it.
 
 
 def fps_feature_selection(descriptor, n_to_select):
@@ -116,11 +152,25 @@ def fps_feature_selection(descriptor, n_to_select):
     Farthest Point Sampling to do the selection; and return a ``TensorMap`` with
     the right structure to be used as properties selection with featomic calculators
     """
+    # We are selecting features, i.e. columns of the values. To do the selection in
+    # all blocks at once, we gather the transposed values of all blocks in a single
+    # array. Blocks with fewer samples are padded with zeros, which does not change
+    # the distance between features. Blocks with fewer features are also padded, and
+    # the padding features are never selected.
+    n_features = np.array([len(block.properties) for block in descriptor])
+    n_samples = max(len(block.samples) for block in descriptor)
+
+    points = np.zeros((len(descriptor), np.max(n_features), n_samples))
+    for i, block in enumerate(descriptor):
+        points[i, : n_features[i], : len(block.samples)] = block.values.T
+
+    all_selected = farthest_point_sampling(points, n_features, n_to_select)
+
     blocks = []
-    for block in descriptor:
-        # create a separate FPS selector for each block
-        fps = FPS(n_to_select=n_to_select)
-        mask = fps.fit(block.values).get_support()
+    for block, selected in zip(descriptor, all_selected):
+        mask = np.zeros(len(block.properties), dtype=bool)
+        mask[selected] = True
+
         selected_properties = Labels(
             names=block.properties.names,
             values=block.properties.values[mask],
@@ -1,5 +1,4 @@
 import abc
-import warnings
 from typing import Optional
 
 import numpy as np
@@ -92,15 +91,15 @@ class Willatt2018(RadialScaling):
             else:
                 return np.ones_like(positions)
         else:
+            rs = positions / self.scale
             if derivative:
-                self.rate / (self.rate + (positions / self.scale) ** self.exponent)
-            else:
-                rs = positions / self.scale
                 denominator = (self.rate + rs**self.exponent) ** 2
 
                 factor = -self.rate * self.exponent / self.scale
 
                 return factor * rs ** (self.exponent - 1) / denominator
+            else:
+                return self.rate / (self.rate + rs**self.exponent)
 
 
 class AtomicDensity(metaclass=abc.ABCMeta):
@@ -240,18 +239,28 @@ class Gaussian(AtomicDensity):
     ):
         super().__init__(center_atom_weight=center_atom_weight, scaling=scaling)
         self.width = float(width)
+        self._update_constants()
+
+    def _update_constants(self):
+        # constants used in `compute`, they are re-computed if `width` changes
+        self._constants_width = self.width
+
+        width_sq = self.width**2
+        self._prefactor = 1 / (np.pi * width_sq) ** (3 / 4)
+        self._inv_width_sq = 1 / width_sq
+        self._inv_two_width_sq = 1 / (2 * width_sq)
 
     def get_hypers(self):
         return {"type": "Gaussian", "width": self.width}
 
     def compute(self, positions: np.ndarray, *, derivative: bool) -> np.ndarray:
-        width_sq = self.width**2
-        x = positions**2 / (2 * width_sq)
+        if self.width != self._constants_width:
+            self._update_constants()
 
-        density = np.exp(-x) / (np.pi * width_sq) ** (3 / 4)
+        density = self._prefactor * np.exp(-self._inv_two_width_sq * positions**2)
 
         if derivative:
-            density *= -positions / width_sq
+            density *= -self._inv_width_sq * positions
 
         return density
 
@@ -292,6 +301,19 @@ class SmearedPowerLaw(AtomicDensity):
         super().__init__(center_atom_weight=center_atom_weight, scaling=scaling)
         self.smearing = float(smearing)
         self.exponent = int(exponent)
+        self._update_constants()
+
+    def _update_constants(self):
+        # constants used in `compute`, they are re-computed if `smearing` or `exponent`
+        # change
+        self._constants_hypers = (self.smearing, self.exponent)
+
+        smearing_sq = self.smearing**2
+        self._gaussian = Gaussian(width=self.smearing)
+        self._a = self.exponent / 2
+        self._prefactor = 1 / (2 * smearing_sq) ** self._a
+        self._inv_smearing_sq = 1 / smearing_sq
+        self._inv_two_smearing_sq = 1 / (2 * smearing_sq)
 
     def get_hypers(self):
         return {
@@ -304,13 +326,14 @@ class SmearedPowerLaw(AtomicDensity):
         if not HAS_SCIPY:
             raise ValueError("SmearedPowerLaw requires scipy to be installed")
 
+        if (self.smearing, self.exponent) != self._constants_hypers:
+            self._update_constants()
+
         if self.exponent == 0:
-            proxy = Gaussian(width=self.smearing)
-            return proxy.compute(positions=positions, derivative=derivative)
+            return self._gaussian.compute(positions=positions, derivative=derivative)
         else:
-            smearing_sq = self.smearing**2
-            a = self.exponent / 2
-            x = positions**2 / (2 * smearing_sq)
+            a = self._a
+            x = positions**2 * self._inv_two_smearing_sq
 
             # Evaluating the formula above at :math:`r=0` is problematic because
             # :math:`g(r)` is of the form :math:`0/0`. For practical implementations, it
@@ -331,37 +354,66 @@ class SmearedPowerLaw(AtomicDensity):
             # neglected term is on the order of :math:`1/6x^3`. Therefore, the threshold
             # :math:`x = 10^{-5}` leads to relative errors on the order of the machine
             # epsilon.
-            with warnings.catch_warnings():
-                # Even though we use `np.where` to apply the `_compute_close_zero`
-                # method for small `x`, the `_compute_far_zero` method will also
-                # evaluated for small `x` and sending RuntimeWarnings. We filter these
-                # warnings to avoid that these are presented to the user.
-                warnings.filterwarnings("ignore", category=RuntimeWarning)
-                density = np.where(
-                    x < 1e-5,
-                    self._compute_close_zero(a, x, derivative=derivative),
-                    self._compute_far_zero(a, x, derivative=derivative),
+            # Each expression is only evaluated where it is used. This avoids computing
+            # `_compute_far_zero` for small `x`, where it would also emit
+            # RuntimeWarnings.
+            if np.ndim(x) == 0:
+                # scalar inputs, e.g. when integrating the density with scipy. This
+                # is called a lot, and working directly with Python floats is much
+                # faster than going through 0-dimensional arrays.
+                x = float(x)
+                if x < 1e-5:
+                    density = self._compute_close_zero(a, x, derivative=derivative)
+                else:
+                    density = self._compute_far_zero(a, x, derivative=derivative)
+            else:
+                x = np.asarray(x)
+                # always use at least double precision, as the scipy functions would
+                x = x.astype(np.result_type(x.dtype, np.float64), copy=False)
+
+                close_zero = x < 1e-5
+                far_zero = np.logical_not(close_zero)
+
+                density = np.empty_like(x)
+                density[close_zero] = self._compute_close_zero(
+                    a, x[close_zero], derivative=derivative
+                )
+                density[far_zero] = self._compute_far_zero(
+                    a, x[far_zero], derivative=derivative
                 )
 
-            density *= 1 / scipy.special.gamma(a) / (2 * smearing_sq) ** a
+            density *= self._prefactor
 
             # add inner derivative: ∂x/∂r
             if derivative:
-                density *= positions / smearing_sq
+                density *= positions * self._inv_smearing_sq
 
             return density
 
     def _compute_close_zero(self, a: float, x: np.ndarray, derivative: bool):
         if derivative:
-            return -1 / (a + 1) + x / (a + 2)
+            density = -1 / (a + 1) + x / (a + 2)
         else:
-            return 1 / a - x / (a + 1) + x**2 / (2 * (a + 2))
+            density = 1 / a - x / (a + 1) + x**2 / (2 * (a + 2))
+
+        return density / scipy.special.gamma(a)
 
     def _compute_far_zero(self, a: float, x: np.ndarray, derivative: bool):
-        if derivative:
-            return (
-                np.exp(-x)
-                - a * scipy.special.gamma(a) * scipy.special.gammainc(a, x) / x**a
-            ) / x
+        # this uses the regularized incomplete gamma function :math:`\gamma(a, x) /
+        # \Gamma(a)`, so the :math:`1 / \Gamma(a)` normalization of the density
+        # cancels out here.
+        if a == 0.5:
+            # Coulomb-like potential, :math:`\gamma(1/2, x) / \Gamma(1/2) =
+            # \text{erf}(\sqrt{x})` is a lot cheaper than the general function
+            density = scipy.special.erf(np.sqrt(x))
+        elif a == 1.0:
+            density = -np.expm1(-x)
         else:
-            return scipy.special.gamma(a) * scipy.special.gammainc(a, x) / x**a
+            density = scipy.special.gammainc(a, x)
+        density /= x**a
+        if derivative:
+            density *= -a
+            density += np.exp(-x) / scipy.special.gamma(a)
+            density /= x
+
+        return density
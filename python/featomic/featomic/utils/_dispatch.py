@@ -9,7 +9,7 @@ from typing import List, Optional, Union
 
 import numpy as np
 
-from ._backend import Device, DType, torch_jit_is_scripting
+from ._backend import Array, Device, DType, torch_jit_is_scripting
 
 
 try:
@@ -98,14 +98,30 @@ def list_to_array(array, data: List[List[int]]):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
-def matmul(a, b):
-    """Matrix product of two arrays."""
+def matmul(a, b, out: Optional[Array] = None):
+    """
+    Matrix product of two arrays. If ``out`` is given, the result is stored in this
+    array and returned.
+    """
     if isinstance(a, TorchTensor):
         _check_all_torch_tensor([b])
-        return torch.matmul(a, b)
+        if out is None:
+            return torch.matmul(a, b)
+        elif out.is_contiguous() and not (
+            a.requires_grad or b.requires_grad or out.requires_grad
+        ):
+            # writing directly in a contiguous `out` avoids a temporary array and a
+            # copy. For non-contiguous `out`, torch would do the copy internally and
+            # be slower than the code below.
+            return torch.matmul(a, b, out=out)
+        else:
+            # `torch.matmul(..., out=out)` does not support autograd, so we copy the
+            # result instead
+            out.copy_(torch.matmul(a, b))
+            return out
     elif isinstance(a, np.ndarray):
         _check_all_np_ndarray([b])
-        return np.matmul(a, b)
+        return np.matmul(a, b, out=out)
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
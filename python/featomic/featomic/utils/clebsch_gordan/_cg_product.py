@@ -60,9 +60,14 @@ class ClebschGordanProduct(TorchModule):
         :param arrays_backend: :py:class:`str`, the backend to use for array operations.
             If ``None``, the backend is automatically selected based on the environment.
             Possible values are "numpy" and "torch".
-        :param dtype: the scalar type to use to store coefficients
+        :param dtype: the scalar type to use to store coefficients. Half precision
+            types (``torch.float16`` and ``torch.bfloat16``) are supported with the
+            torch arrays backend.
         :param device: the computational device to use for calculations. This must be
             ``"cpu"`` if ``array_backend="numpy"``.
+
+        The coefficients are converted to the dtype and device of the input tensors in
+        :py:meth:`compute` if needed.
         """
 
         super().__init__()
@@ -131,6 +136,9 @@ class ClebschGordanProduct(TorchModule):
             dtype=dtype,
             device=device,
         )
+        # copy of the coefficients converted to the dtype and device of the last
+        # input data, ``self._cg_coefficients`` is kept as the reference
+        self._converted_cg_coefficients = self._cg_coefficients
 
         if keys_filter is None:
             self._keys_filter = _keys_filter_noop
@@ -318,7 +326,18 @@ class ClebschGordanProduct(TorchModule):
             output_keys, combinations
         )
 
-        # 4. Do the CG tensor product for each block combination
+        # 4. Do the CG tensor product for each block combination, making sure the CG
+        # coefficients use the same dtype and device as the input data first. The
+        # converted coefficients are kept for the next calls, and always created from
+        # the reference coefficients to not lose precision when the dtype changes.
+        if (
+            tensor_1.dtype != self._converted_cg_coefficients.dtype
+            or tensor_1.device != self._converted_cg_coefficients.device
+        ):
+            self._converted_cg_coefficients = self._cg_coefficients.to(
+                dtype=tensor_1.dtype, device=tensor_1.device
+            )
+
         output_blocks: List[TensorBlock] = []
         for combination in combinations:
             output_blocks.extend(
@@ -326,7 +345,7 @@ class ClebschGordanProduct(TorchModule):
                     tensor_1.block(combination.first),
                     tensor_2.block(combination.second),
                     o3_lambdas=combination.o3_lambdas,
-                    cg_coefficients=self._cg_coefficients,
+                    cg_coefficients=self._converted_cg_coefficients,
                     cg_backend="metadata" if compute_metadata else self._cg_backend,
                 )
             )
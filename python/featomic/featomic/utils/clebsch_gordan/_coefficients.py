@@ -4,7 +4,7 @@ Gordan coefficients for use in CG combinations.
 """
 
 import math
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import numpy as np
 import wigners
@@ -56,7 +56,7 @@ def calculate_cg_coefficients(
     Sparse:
         - samples: ``(m1, m2, mu)``, where ``m1`` and ``m2`` are the m component values
           for the two arrays being combined and ``mu`` is the m component value for the
-          resulting array.
+          resulting array. Only non-zero coefficients are stored, sorted by ``mu``.
         - components: ``[]``, i.e. no components axis.
         - properties: ``cg_coefficient = [0]``
 
@@ -65,7 +65,10 @@ def calculate_cg_coefficients(
         for storing the CG coefficients.
     :param arrays_backend: whether to use ``"numpy"`` or ``"torch"`` arrays to store the
         coefficients.
-    :param dtype: the scalar type to use to store coefficients
+    :param dtype: the scalar type to use to store coefficients. With torch arrays,
+        half precision types (``torch.float16`` and ``torch.bfloat16``) are also
+        supported, the coefficients are then computed in single precision and
+        rounded to ``dtype``.
     :param device: the computational device to use for calculations. This must be
         ``"cpu"`` if ``array_backend="numpy"``.
     :returns: :py:class:`TensorMap` of the Clebsch-Gordan coefficients.
@@ -76,10 +79,14 @@ def calculate_cg_coefficients(
             complex_dtype = torch.complex64
         elif dtype == torch.float64:
             complex_dtype = torch.complex128
+        elif dtype == torch.float16 or dtype == torch.bfloat16:
+            # there is no complex type matching these, so the coefficients are
+            # computed in single precision and rounded to `dtype` at the end
+            complex_dtype = torch.complex64
         else:
             raise ValueError(
-                f"invalid dtype ({dtype}), only torch.float32 and torch.float64 are "
-                "supported"
+                f"invalid dtype ({dtype}), only torch.float16, torch.bfloat16, "
+                "torch.float32 and torch.float64 are supported"
             )
 
         complex_like = torch.empty(0, dtype=complex_dtype, device=device)
@@ -291,28 +298,23 @@ def _cg_coeff_dict_to_tensormap_sparse(
     for l1, l2, o3_lambda in dict_keys:
         cg_l1l2lam_dense = coeff_dict[(l1, l2, o3_lambda)]
 
-        # Find the dense indices of the non-zero CG coeffs
-        nonzeros_cg_coeffs_idx = _dispatch.where(
-            _dispatch.abs(cg_l1l2lam_dense) > 1e-15
+        # Find the dense indices of the non-zero CG coeffs. We search them in a
+        # [mu, m2, m1] view of the coefficients, so they are sorted by mu. This allows
+        # the sparse CG products to work on contiguous ranges of non-zero coefficients
+        # for each mu.
+        mu, m2, m1 = _dispatch.where(
+            _dispatch.abs(cg_l1l2lam_dense.swapaxes(0, 2)) > 1e-15
         )
 
-        # Create a sparse dictionary indexed by  of the non-zero CG coeffs
-        cg_l1l2lam_sparse = {}
-        for i in range(len(nonzeros_cg_coeffs_idx[0])):
-            m1 = nonzeros_cg_coeffs_idx[0][i]
-            m2 = nonzeros_cg_coeffs_idx[1][i]
-            mu = nonzeros_cg_coeffs_idx[2][i]
-            cg_l1l2lam_sparse[(m1, m2, mu)] = cg_l1l2lam_dense[m1, m2, mu]
-
-        l1l2lam_sample_values = []
-        for m1m2mu_key in cg_l1l2lam_sparse.keys():
-            l1l2lam_sample_values.append(m1m2mu_key)
         # extending shape by samples and properties
-        values = _dispatch.real_array_like(
-            [*cg_l1l2lam_sparse.values()], real_like
-        ).reshape(-1, 1)
+        values = cg_l1l2lam_dense[m1, m2, mu].reshape(-1, 1)
         l1l2lam_sample_values = _dispatch.int_array_like(
-            l1l2lam_sample_values, labels_values_like
+            _dispatch.to_int_list(
+                _dispatch.concatenate(
+                    [m1.reshape(-1, 1), m2.reshape(-1, 1), mu.reshape(-1, 1)], axis=1
+                )
+            ),
+            labels_values_like,
         )
         # we have to move put the m1 m2 m3 inside a block so we can access it easier
         # inside cg combine function,
@@ -428,31 +430,12 @@ def cg_couple(
     l2 = (array.shape[2] - 1) // 2
 
     if cg_backend == "python-sparse":
-        arrays = {}
-        for m1 in range(2 * l1 + 1):
-            for m2 in range(2 * l2 + 1):
-                arrays[str((m1, m2))] = array[:, m1, m2, :]
-
         return [
-            _cg_couple_sparse(arrays, l1, l2, o3_lambda, cg_coefficients)
+            _cg_couple_sparse(array, l1, l2, o3_lambda, cg_coefficients)
             for o3_lambda in o3_lambdas
         ]
     elif cg_backend == "python-dense":
-        results = []
-
-        n_samples = array.shape[0]
-        n_properties = array.shape[3]
-
-        array = array.swapaxes(1, 3)
-        array = array.reshape(n_samples * n_properties, 2 * l2 + 1, 2 * l1 + 1)
-
-        for o3_lambda in o3_lambdas:
-            result = _cg_couple_dense(array, o3_lambda, cg_coefficients)
-            result = result.reshape(n_samples, n_properties, -1)
-            result = result.swapaxes(1, 2)
-            results.append(result)
-
-        return results
+        return _cg_couple_dense(array, l1, l2, o3_lambdas, cg_coefficients)
 
     else:
         raise ValueError(
@@ -462,78 +445,157 @@ def cg_couple(
 
 
 def _cg_couple_sparse(
-    arrays: Dict[str, Array],
+    array: Array,
     l1: int,
     l2: int,
     o3_lambda: int,
     cg_coefficients: TensorMap,
-):
+) -> Array:
     """
     Couple two spherical harmonics (of degree ``l1`` and ``l2``) to a single one (of
-    degree ``o3_lambda``) using CG coefficients. This is a "dense" implementation, using
-    all CG coefficients at the same time.
+    degree ``o3_lambda``) using CG coefficients. This is a "sparse" implementation,
+    only using the non-zero CG coefficients.
 
+    :param array: input array, we expect a shape of ``[samples, 2*l1 + 1, 2*l2 + 1,
+        properties]``
     :param l1: degree of the first spherical harmonic
-    :param l2: degree of the first spherical harmonic
-    :param arrays: dictionary of arrays for the different ``(m1, m2)`` corresponding to
-        ``l1`` and ``l2``. Each array in the dictionary is expected to have a shape
-        ``[samples, properties]`` and correspond to a single ``(m1, m2)`` pair.
+    :param l2: degree of the second spherical harmonic
     :param o3_lambda: value of lambda for the output spherical harmonic
     :param cg_coefficients: CG coefficients as returned by
         :py:func:`calculate_cg_coefficients` with ``cg_backed="python-sparse"``
     """
+    assert len(array.shape) == 4
+
+    cg_l1l2lam = _cg_block(cg_coefficients, l1, l2, o3_lambda)
+    m1, m2, mu = _sparse_cg_indices(cg_l1l2lam)
+    cg_values = _dispatch.to(cg_l1l2lam.values[:, 0], dtype=array.dtype)
 
-    array = list(arrays.values())[0]
-    assert len(array.shape) == 2
+    # [samples, l1, l2, properties] => [samples, n_nonzero, properties]
+    terms = array[:, m1, m2, :]
 
     output = _dispatch.zeros_like(
-        array, (2 * o3_lambda + 1, array.shape[0], array.shape[1])
+        array, (array.shape[0], 2 * o3_lambda + 1, array.shape[3])
     )
+    for m, start, stop in _nonzero_ranges_by_mu(mu):
+        # [n_nonzero_mu] @ [samples, n_nonzero_mu, properties] => [samples, properties]
+        _dispatch.matmul(
+            cg_values[start:stop], terms[:, start:stop, :], out=output[:, m, :]
+        )
 
-    # Fill in each mu component of the output array in turn
-    cg_l1l2lam = cg_coefficients.block({"l1": l1, "l2": l2, "lambda": o3_lambda})
-    cg_l1l2lam_samples = cg_l1l2lam.samples
-    for i in range(len(cg_l1l2lam_samples)):
-        m1m2mu = cg_l1l2lam_samples.entry(i)
-        m1 = int(m1m2mu[0])
-        m2 = int(m1m2mu[1])
-        mu = int(m1m2mu[2])
-        # Broadcast arrays, multiply together and with CG coeff
-        output[mu, :, :] += arrays[str((m1, m2))] * cg_l1l2lam.values[i, 0]
+    return output
 
-    return output.swapaxes(0, 1)
+
+def _cg_block(
+    cg_coefficients: TensorMap, l1: int, l2: int, o3_lambda: int
+) -> TensorBlock:
+    """
+    Get the block of CG coefficients for the given ``l1``, ``l2`` and ``o3_lambda``.
+    This directly looks for the position of the key, which is faster than selecting the
+    block with a dictionary.
+    """
+    position = cg_coefficients.keys.position([l1, l2, o3_lambda])
+    if position is None:
+        raise ValueError(
+            f"missing CG coefficients for l1={l1}, l2={l2} and lambda={o3_lambda}"
+        )
+
+    return cg_coefficients.block(position)
+
+
+def _sparse_cg_indices(cg_l1l2lam: TensorBlock) -> Tuple[Array, Array, Array]:
+    """
+    Get the ``m1``, ``m2`` and ``mu`` indices of the non-zero CG coefficients in a
+    block of sparse CG coefficients.
+    """
+    samples = cg_l1l2lam.samples.values
+    m1 = _dispatch.to_index_array(samples[:, 0])
+    m2 = _dispatch.to_index_array(samples[:, 1])
+    mu = _dispatch.to_index_array(samples[:, 2])
+    return m1, m2, mu
+
+
+def _nonzero_ranges_by_mu(mu: Array) -> List[List[int]]:
+    """
+    Get the ranges of non-zero CG coefficients contributing to each ``mu`` in a block
+    of sparse CG coefficients, as a list of ``[mu, start, stop]``. This relies on the
+    non-zero coefficients being sorted by ``mu``, as done by
+    :py:func:`calculate_cg_coefficients`.
+    """
+    # `mu` is read back in a single operation, to avoid synchronizing with the device
+    # for every range when the coefficients are not on the CPU
+    mu_list = _dispatch.to_int_list(mu)
+    n_nonzero = len(mu_list)
+
+    ranges: List[List[int]] = []
+    start = 0
+    for stop in range(1, n_nonzero + 1):
+        if stop == n_nonzero or mu_list[stop] != mu_list[start]:
+            ranges.append([mu_list[start], start, stop])
+            start = stop
+
+    return ranges
 
 
 def _cg_couple_dense(
     array: Array,
-    o3_lambda: int,
+    l1: int,
+    l2: int,
+    o3_lambdas: List[int],
     cg_coefficients: TensorMap,
-) -> Array:
+) -> List[Array]:
     """
     Couple two spherical harmonics (of degree ``l1`` and ``l2``) to a single one (of
     degree ``o3_lambda``) using CG coefficients. This is a "dense" implementation, using
     all CG coefficients at the same time.
 
-    :param array: input array, we expect a shape of ``[samples, 2*l1 + 1, 2*l2 + 1]``
-    :param o3_lambda: value of lambda for the output spherical harmonic
+    :param array: input array, we expect a shape of ``[samples, 2*l1 + 1, 2*l2 + 1,
+        properties]``
+    :param l1: degree of the first spherical harmonic
+    :param l2: degree of the second spherical harmonic
+    :param o3_lambdas: list of values of lambda for the output spherical harmonics
     :param cg_coefficients: CG coefficients as returned by
         :py:func:`calculate_cg_coefficients` with ``cg_backed="python-dense"``
     """
-    assert len(array.shape) == 3
+    assert len(array.shape) == 4
 
-    l1 = (array.shape[1] - 1) // 2
-    l2 = (array.shape[2] - 1) // 2
+    if len(o3_lambdas) == 0:
+        return []
 
-    cg_l1l2lam = cg_coefficients.block({"l1": l1, "l2": l2, "lambda": o3_lambda}).values
+    n_samples = array.shape[0]
+    n_properties = array.shape[3]
 
-    # [samples, l1, l2] => [samples, (l1 l2)]
-    array = array.reshape(-1, (2 * l1 + 1) * (2 * l2 + 1))
+    # [samples, l1, l2, properties] => [samples, (l1 l2), properties]
+    array = array.reshape(n_samples, (2 * l1 + 1) * (2 * l2 + 1), n_properties)
 
-    # [l1, l2, lambda] -> [(l1 l2), lambda]
-    cg_l1l2lam = cg_l1l2lam.reshape(-1, 2 * o3_lambda + 1)
+    # Stack the CG coefficients for all lambda along the mu axis. The coefficients
+    # are transposed instead of the (much larger) array, so that the matrix
+    # multiplication directly produces the output in the right layout.
+    cg_l1l2: List[Array] = []
+    for o3_lambda in o3_lambdas:
+        cg_l2l1lam = _cg_block(cg_coefficients, l2, l1, o3_lambda).values
 
-    # [samples, (l1 l2)] @ [(l1 l2), lambda] => [samples, lambda]
-    return array @ cg_l1l2lam
+        # [1, l2, l1, lambda, 1] => [lambda, l1, l2]
+        cg_l2l1lam = cg_l2l1lam.reshape(2 * l2 + 1, 2 * l1 + 1, 2 * o3_lambda + 1)
+        cg_l1l2.append(_dispatch.swapaxes(cg_l2l1lam, 0, 2))
+
+    # => [all_lambda, (l1 l2)]
+    cg_all = _dispatch.concatenate(cg_l1l2, axis=0)
+    cg_all = cg_all.reshape(-1, (2 * l1 + 1) * (2 * l2 + 1))
+    cg_all = _dispatch.to(cg_all, dtype=array.dtype)
+
+    # [all_lambda, (l1 l2)] @ [samples, (l1 l2), properties]
+    #     => [samples, all_lambda, properties]
+    output = _dispatch.matmul(cg_all, array)
+
+    # Split the output for each lambda
+    results = []
+    start = 0
+    for o3_lambda in o3_lambdas:
+        stop = start + 2 * o3_lambda + 1
+        results.append(output[:, start:stop, :])
+        start = stop
+
+    return results
 
 
 # ======================================================================= #
@@ -644,29 +706,71 @@ def _cg_tensor_product_sparse(
     n_p = array_1.shape[2]  # number of properties in array_1
     n_q = array_2.shape[2]  # number of properties in array_2
 
-    # Compute the partial tensor products
-    partial_tensor_products = {}
+    if len(o3_lambdas) == 0:
+        return []
+
+    # Gather the non-zero CG coefficients for all lambda together, and find which
+    # range of non-zero coefficients contributes to each component of the output
+    # (stacking the mu components of all lambda)
+    all_m1: List[Array] = []
+    all_m2: List[Array] = []
+    all_cg_values: List[Array] = []
+    all_ranges: List[List[int]] = []
+    n_mu = 0
+    n_nonzero = 0
     for o3_lambda in o3_lambdas:
-        cg_l1l2lam = cg_coefficients.block({"l1": l1, "l2": l2, "lambda": o3_lambda})
-        for i in range(len(cg_l1l2lam.samples)):
-            m1m2mu = cg_l1l2lam.samples.entry(i)
-            m1 = int(m1m2mu[0])
-            m2 = int(m1m2mu[1])
-
-            # We use a string as dict key since TorchScript does not support (int, int)
-            dict_key = str((m1, m2))
-            if dict_key not in partial_tensor_products:
-                partial_tensor_products[dict_key] = (
-                    array_1[:, m1, :, None] * array_2[:, m2, None, :]
-                ).reshape(n_s, n_p * n_q)
-
-    # Couple l1,l2 to the different lambda, re-using the partial tensor products
+        cg_l1l2lam = _cg_block(cg_coefficients, l1, l2, o3_lambda)
+        m1, m2, mu = _sparse_cg_indices(cg_l1l2lam)
+        all_m1.append(m1)
+        all_m2.append(m2)
+        all_cg_values.append(cg_l1l2lam.values[:, 0])
+
+        for m, start, stop in _nonzero_ranges_by_mu(mu):
+            all_ranges.append([n_mu + m, n_nonzero + start, n_nonzero + stop])
+
+        n_mu += 2 * o3_lambda + 1
+        n_nonzero += m1.shape[0]
+
+    m1 = _dispatch.concatenate(all_m1, axis=0)
+    m2 = _dispatch.concatenate(all_m2, axis=0)
+    cg_values = _dispatch.to(
+        _dispatch.concatenate(all_cg_values, axis=0), dtype=array_1.dtype
+    )
+
+    # Gather the terms corresponding to all non-zero CG coefficients at once,
+    # including the CG coefficients in the terms coming from the array with the
+    # fewest properties, to create a smaller temporary array.
+    # [samples, n_nonzero, p]
+    terms_1 = array_1[:, m1, :]
+    # [samples, n_nonzero, q]
+    terms_2 = array_2[:, m2, :]
+    if n_p <= n_q:
+        terms_1 = terms_1 * cg_values.reshape(1, -1, 1)
+    else:
+        terms_2 = terms_2 * cg_values.reshape(1, -1, 1)
+
+    output = _dispatch.zeros_like(array_1, (n_s, n_mu, n_p, n_q))
+    for m, start, stop in all_ranges:
+        # contract all the non-zero terms contributing to this component of the
+        # output, doing the tensor product between p and q at the same time, and
+        # storing the result directly in the output array.
+        # [samples, p, n_nonzero_mu] @ [samples, n_nonzero_mu, q] => [samples, p, q]
+        _dispatch.matmul(
+            terms_1[:, start:stop, :].swapaxes(1, 2),
+            terms_2[:, start:stop, :],
+            out=output[:, m, :, :],
+        )
+
+    # => [samples, all_lambda, (p q)]
+    output = output.reshape(n_s, n_mu, n_p * n_q)
+
+    # Split the output for each lambda
     result = []
+    start = 0
     for o3_lambda in o3_lambdas:
-        output = _cg_couple_sparse(
-            partial_tensor_products, l1, l2, o3_lambda, cg_coefficients
-        )
-        result.append(output)
+        stop = start + 2 * o3_lambda + 1
+        result.append(output[:, start:stop, :])
+        start = stop
 
     return result
 
@@ -687,23 +791,45 @@ def _cg_tensor_product_dense(
     n_p = array_1.shape[2]  # number of properties in array_1
     n_q = array_2.shape[2]  # number of properties in array_2
 
-    # we broadcast it in this way so we only need to do one swapaxes in the next step
-    # The resulting shape of tensor_product is [samples, l2, p, l1, q]
-    tensor_product = array_1[:, None, None, :, :] * array_2[:, :, :, None, None]
+    # [samples, l1, p] => [samples, 1, p, l1]
+    array_1 = _dispatch.swapaxes(array_1, 1, 2).reshape(n_s, 1, n_p, 2 * l1 + 1)
 
-    # [samples, l2, p, l1, q] -> [samples, q, p, l1, l2]
-    tensor_product = _dispatch.swapaxes(tensor_product, 1, 4)
-    # [samples, l2, p, l1, q] -> [(samples q p), l1, l2]
-    tensor_product = tensor_product.reshape(-1, 2 * l1 + 1, 2 * l2 + 1)
+    if len(o3_lambdas) == 0:
+        return []
 
+    # Stack the CG coefficients for all lambda along the mu axis, so the tensor
+    # products for all lambda are computed with the same matrix multiplications
+    cg_l1l2: List[Array] = []
+    for o3_lambda in o3_lambdas:
+        cg_l1l2lam = _cg_block(cg_coefficients, l1, l2, o3_lambda).values
+
+        # [1, l1, l2, lambda, 1] => [lambda, l1, l2]
+        cg_l1l2lam = cg_l1l2lam.reshape(2 * l1 + 1, 2 * l2 + 1, 2 * o3_lambda + 1)
+        cg_l1l2.append(_dispatch.swapaxes(_dispatch.swapaxes(cg_l1l2lam, 0, 2), 1, 2))
+
+    # => [(all_lambda l1), l2]
+    cg_all = _dispatch.concatenate(cg_l1l2, axis=0).reshape(-1, 2 * l2 + 1)
+    cg_all = _dispatch.to(cg_all, dtype=array_1.dtype)
+    n_mu = cg_all.shape[0] // (2 * l1 + 1)
+
+    # Contract the CG coefficients with array_2 first, and then with array_1. This does
+    # the full tensor product with two matrix multiplications, without creating the
+    # [samples, l1, l2, p, q] intermediate array.
+    # [(all_lambda l1), l2] @ [samples, l2, q] => [samples, (all_lambda l1), q]
+    output = _dispatch.matmul(cg_all, array_2)
+    # => [samples, all_lambda, l1, q]
+    output = output.reshape(n_s, n_mu, 2 * l1 + 1, n_q)
+    # [samples, 1, p, l1] @ [samples, all_lambda, l1, q] => [samples, all_lambda, p, q]
+    output = _dispatch.matmul(array_1, output)
+    # => [samples, all_lambda, (p q)]
+    output = output.reshape(n_s, n_mu, n_p * n_q)
+
+    # Split the output for each lambda
     result = []
+    start = 0
     for o3_lambda in o3_lambdas:
-        # output shape is [(samples q p), lambda]
-        output = _cg_couple_dense(tensor_product, o3_lambda, cg_coefficients)
-        #  => [samples, (q p), lambda]
-        output = output.reshape(n_s, (n_p * n_q), -1)
-        #  => [samples, lambda, (q p)]
-        output = _dispatch.swapaxes(output, 1, 2)
-        result.append(output)
+        stop = start + 2 * o3_lambda + 1
+        result.append(output[:, start:stop, :])
+        start = stop
 
     return result
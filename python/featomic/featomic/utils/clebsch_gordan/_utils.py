@@ -287,6 +287,7 @@ def _match_samples_of_blocks(
     if len(block_1.samples.names) == len(block_2.samples.names):
         if not block_1.samples == block_2.samples:
             raise ValueError("Samples dimensions of the two blocks are not equivalent.")
+        return block_1, block_2
 
     # First find the block with fewer dimensions. Reorder to have this block on the
     # 'left' for simplicity, but record the original order for the final output
@@ -307,12 +308,14 @@ def _match_samples_of_blocks(
     # Broadcast the values of block_1 along the samples dimensions to match those of
     # block_2
     dims_2 = [block_2.samples.names.index(name) for name in block_1.samples.names]
-    matches: List[int] = _dispatch.where(
+    # the matching indices stay in an array to avoid a round trip through the host
+    # when the data is on another device
+    matches = _dispatch.where(
         _dispatch.all(
             block_2.samples.values[:, dims_2][:, None] == block_1.samples.values,
             axis=2,
         )
-    )[1].tolist()
+    )[1]
 
     # Build new block and return
     block_1 = TensorBlock(
@@ -349,22 +352,22 @@ def _compute_labels_full_cartesian_product(
     # Create the new labels names by concatenating the names of the two input labels
     labels_names: List[str] = labels_1.names + labels_2.names
 
-    # create cross product list of indices in a torch-scriptable way of
-    # [[i, j] for i in range(len(labels_1.values)) for j in
-    #             range(len(labels_2.values))]
+    # create the cross product of entries with the same order as
+    # [labels_2[i] + labels_1[j] for i in range(len(labels_2)) for j in
+    #             range(len(labels_1))]
     # [0, 1, 2], [0, 1] -> [[0, 1], [0, 2], [1, 0], [1, 1], [2, 0], [2, 1]]
-    labels_1_labels_2_product_idx = _dispatch.cartesian_prod(
-        _dispatch.int_range_like(0, len(labels_2.values), like=labels_2.values),
-        _dispatch.int_range_like(0, len(labels_1.values), like=labels_1.values),
+    # using arrays indexing, so that the values stay on the same device
+    n_entries_1 = len(labels_1)
+    product_idx = _dispatch.int_range_like(
+        0, len(labels_2) * n_entries_1, like=labels_1.values
     )
     return Labels(
         names=labels_names,
-        values=_dispatch.int_array_like(
+        values=_dispatch.concatenate(
             [
-                _dispatch.to_int_list(labels_2.values[indices[0]])
-                + _dispatch.to_int_list(labels_1.values[indices[1]])
-                for indices in labels_1_labels_2_product_idx
+                labels_2.values[product_idx // n_entries_1],
+                labels_1.values[product_idx % n_entries_1],
             ],
-            like=labels_1.values,
+            axis=1,
         ),
     )
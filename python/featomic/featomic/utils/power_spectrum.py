@@ -1,9 +1,10 @@
 import json
 from math import sqrt
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from . import _dispatch
 from ._backend import (
+    Array,
     CalculatorBase,
     IntoSystem,
     Labels,
@@ -160,20 +161,14 @@ class PowerSpectrum(TorchModule):
                     f"`calculator_2`, got '{self.calculator_2.c_name}'"
                 )
 
-            parameters_1 = json.loads(calculator_1.parameters)
-            parameters_2 = json.loads(calculator_2.parameters)
-            if parameters_1["basis"]["type"] != "TensorProduct":
-                raise ValueError(
-                    "only 'TensorProduct' basis is supported for calculator_1"
-                )
-
-            if parameters_2["basis"]["type"] != "TensorProduct":
-                raise ValueError(
-                    "only 'TensorProduct' basis is supported for calculator_2"
+            max_angular_1 = _tensor_product_max_angular(calculator_1, "calculator_1")
+            if calculator_2 is calculator_1:
+                max_angular_2 = max_angular_1
+            else:
+                max_angular_2 = _tensor_product_max_angular(
+                    calculator_2, "calculator_2"
                 )
 
-            max_angular_1 = parameters_1["basis"]["max_angular"]
-            max_angular_2 = parameters_2["basis"]["max_angular"]
             if max_angular_1 != max_angular_2:
                 raise ValueError(
                     "'basis.max_angular' must be the same in both calculators, "
@@ -263,75 +258,118 @@ class PowerSpectrum(TorchModule):
                 keys_to_move
             )
 
-        new_blocks: List[TensorBlock] = []
-        new_keys_values: List[List[int]] = []
+        # read the keys of the second spherical expansion only once, instead of
+        # creating a new selection and searching matching keys for every block
+        all_o3_lambda_2 = _dispatch.to_int_list(
+            spherical_expansion_2.keys.column("o3_lambda")
+        )
+        all_center_types_2 = _dispatch.to_int_list(
+            spherical_expansion_2.keys.column("center_type")
+        )
 
-        for key, block_1 in spherical_expansion_1.items():
+        # first, find all the pairs of blocks to combine together
+        pairs_o3_lambda: List[int] = []
+        pairs_center_type: List[int] = []
+        pairs_blocks: List[Tuple[TensorBlock, TensorBlock]] = []
+        # is block_2 the same as block_1 for this pair?
+        pairs_symmetric: List[bool] = []
+        for block_1_i, (key, block_1) in enumerate(spherical_expansion_1.items()):
             o3_lambda = key["o3_lambda"]
             center_type = key["center_type"]
 
+            # Find the blocks that have the same o3_lambda and center_type
+            for block_2_i in range(len(all_o3_lambda_2)):
+                if (
+                    all_o3_lambda_2[block_2_i] == o3_lambda
+                    and all_center_types_2[block_2_i] == center_type
+                ):
+                    block_2 = spherical_expansion_2.block_by_id(block_2_i)
+                    symmetric = self.calculator_2 is None and block_2_i == block_1_i
+
+                    # Make sure that samples are the same. This should not happen,
+                    # and can only be different when the blocks come from different
+                    # spherical expansions.
+                    if not symmetric:
+                        assert block_1.samples == block_2.samples
+
+                    pairs_o3_lambda.append(o3_lambda)
+                    pairs_center_type.append(center_type)
+                    pairs_blocks.append((block_1, block_2))
+                    pairs_symmetric.append(symmetric)
+
+        # All the blocks for a given center type will be concatenated along the
+        # properties in the output (see `_l_to_properties`). Instead of allocating a
+        # new array for each block and concatenating them afterward, the values are
+        # directly computed inside a single merged array for each center type.
+        center_types = _unique_in_order(pairs_center_type)
+        merged_values, values_offsets = _allocate_merged_values(
+            pairs_o3_lambda, pairs_center_type, pairs_blocks, center_types
+        )
+
+        new_blocks: List[TensorBlock] = []
+        new_keys_values: List[List[int]] = []
+        properties_cache: List[Tuple[Labels, Labels, Labels]] = []
+        for pair_i, (block_1, block_2) in enumerate(pairs_blocks):
+            o3_lambda = pairs_o3_lambda[pair_i]
+            center_type = pairs_center_type[pair_i]
+
             # For consistency with a full Clebsch-Gordan product we need to add
             # a `-1^l / sqrt(2 l + 1)` factor to the power spectrum invariants
             factor = (-1) ** o3_lambda / sqrt(2 * o3_lambda + 1)
 
-            # Find that block indices that have the same o3_lambda and center_type
-            selection = Labels(
-                names=["o3_lambda", "center_type"],
-                values=_dispatch.list_to_array(
-                    data=[[o3_lambda, center_type]],
-                    array=spherical_expansion_1.keys.values,
-                ),
-            )
-            blocks_2 = spherical_expansion_2.blocks(selection)
-            for block_2 in blocks_2:
-                # Make sure that samples are the same. This should not happen.
-                assert block_1.samples == block_2.samples
-
-                properties_1 = block_1.properties
-                properties_2 = block_2.properties
-
-                n_keys_dimensions = (
-                    properties_1.values.shape[1] + properties_2.values.shape[1]
-                )
-
-                new_property_values = _dispatch.empty_like(
-                    array=properties_1.values,
-                    shape=[
-                        properties_1.values.shape[0],
-                        properties_2.values.shape[0],
-                        n_keys_dimensions,
-                    ],
-                )
-
-                for i, values_1 in enumerate(properties_1.values):
-                    for j, values_2 in enumerate(properties_2.values):
-                        new_property_values[i, j, : len(values_1)] = values_1
-                        new_property_values[i, j, len(values_1) :] = values_2
-
-                properties = Labels(
-                    names=["neighbor_1_type", "n_1", "neighbor_2_type", "n_2"],
-                    values=new_property_values.reshape(-1, n_keys_dimensions),
-                )
-
-                # Compute the invariants by summation and store the results this is
-                # equivalent to an einsum with: ima, imb -> iab
-                data = factor * _dispatch.matmul(
-                    block_1.values.swapaxes(1, 2), block_2.values
+            properties_1 = block_1.properties
+            properties_2 = block_2.properties
+
+            # the same pairs of properties are found in multiple blocks (e.g. for
+            # all center types), so we re-use the corresponding Labels instead of
+            # building them again
+            properties: Optional[Labels] = None
+            for cached_1, cached_2, cached in properties_cache:
+                if cached_1 == properties_1 and cached_2 == properties_2:
+                    properties = cached
+                    break
+
+            if properties is None:
+                properties = _properties_product(properties_1, properties_2)
+                properties_cache.append((properties_1, properties_2, properties))
+
+            # Compute the invariants by summation and store the results this is
+            # equivalent to an einsum with: ima, imb -> iab. The factor is applied
+            # to the (smaller) input instead of the output of the matmul.
+            #
+            # `swapaxes` only creates a view with column-major matrices, which BLAS
+            # can use directly. Making a transposed contiguous copy first is slower.
+            values_1 = (factor * block_1.values).swapaxes(1, 2)
+            merged = merged_values[center_types.index(center_type)]
+            if merged is None:
+                data = _dispatch.matmul(values_1, block_2.values)
+                data = data.reshape(data.shape[0], data.shape[1] * data.shape[2])
+            else:
+                start = values_offsets[pair_i]
+                n_properties_1 = values_1.shape[1]
+                n_properties_2 = block_2.values.shape[2]
+                data = merged[:, start : start + n_properties_1 * n_properties_2]
+                _dispatch.matmul(
+                    values_1,
+                    block_2.values,
+                    out=data.reshape(data.shape[0], n_properties_1, n_properties_2),
                 )
 
-                new_block = TensorBlock(
-                    values=data.reshape(data.shape[0], -1),
-                    samples=block_1.samples,
-                    components=[],
-                    properties=properties,
-                )
+            new_block = TensorBlock(
+                values=data,
+                samples=block_1.samples,
+                components=[],
+                properties=properties,
+            )
 
-                for parameter in block_1.gradients_list():
-                    if parameter == "positions":
-                        _positions_gradients(new_block, block_1, block_2, factor)
+            for parameter in block_1.gradients_list():
+                if parameter == "positions":
+                    _positions_gradients(
+                        new_block, block_1, block_2, factor, pairs_symmetric[pair_i]
+                    )
 
-                new_keys_values.append([o3_lambda, center_type])
-                new_blocks.append(new_block)
+            new_keys_values.append([o3_lambda, center_type])
+            new_blocks.append(new_block)
 
         new_keys = Labels(
             names=["l", "center_type"],
@@ -340,7 +378,7 @@ class PowerSpectrum(TorchModule):
             ),
         )
 
-        return TensorMap(new_keys, new_blocks).keys_to_properties("l")
+        return _l_to_properties(new_keys, new_blocks, merged_values)
 
     def forward(
         self,
@@ -362,59 +400,347 @@ class PowerSpectrum(TorchModule):
         )
 
 
+def _tensor_product_max_angular(calculator: CalculatorBase, name: str) -> int:
+    """
+    Get ``basis.max_angular`` from the parameters of ``calculator``, checking that it
+    uses a ``TensorProduct`` basis.
+    """
+    basis = json.loads(calculator.parameters)["basis"]
+    if basis["type"] != "TensorProduct":
+        raise ValueError(f"only 'TensorProduct' basis is supported for {name}")
+
+    return basis["max_angular"]
+
+
+def _properties_product(properties_1: Labels, properties_2: Labels) -> Labels:
+    """
+    Get the properties of a power spectrum block, containing all combinations of
+    ``properties_1`` and ``properties_2`` entries.
+    """
+    # entries of properties_1 are varying the slowest. This is equivalent to `repeat` on
+    # properties_1 and `tile` on properties_2.
+    n_properties_2 = len(properties_2)
+    product_idx = _dispatch.int_range_like(
+        0, len(properties_1) * n_properties_2, like=properties_1.values
+    )
+    return Labels(
+        names=["neighbor_1_type", "n_1", "neighbor_2_type", "n_2"],
+        values=_dispatch.concatenate(
+            [
+                properties_1.values[product_idx // n_properties_2],
+                properties_2.values[product_idx % n_properties_2],
+            ],
+            axis=1,
+        ),
+    )
+
+
+def _unique_in_order(values: List[int]) -> List[int]:
+    """Get the unique entries in ``values``, in order of first appearance"""
+    unique: List[int] = []
+    for value in values:
+        if value not in unique:
+            unique.append(value)
+    return unique
+
+
+def _allocate_merged_values(
+    pairs_o3_lambda: List[int],
+    pairs_center_type: List[int],
+    pairs_blocks: List[Tuple[TensorBlock, TensorBlock]],
+    center_types: List[int],
+) -> Tuple[List[Optional[Array]], List[int]]:
+    """
+    Allocate one array for each center type, large enough to contain the values of all
+    the power spectrum blocks with this center type, and get the offset of each pair
+    of blocks along the properties of this array.
+
+    The blocks are placed in the order of first appearance of ``o3_lambda``, which
+    matches the properties created by ``_l_to_properties``. If the blocks for a given
+    center type do not have the same number of samples or dtype, the corresponding
+    array is ``None``.
+    """
+    o3_lambdas = _unique_in_order(pairs_o3_lambda)
+    values_offsets = [0 for _ in range(len(pairs_blocks))]
+
+    merged_values: List[Optional[Array]] = []
+    for center_type in center_types:
+        first_values: Optional[Array] = None
+        can_merge = True
+        n_properties = 0
+        for o3_lambda in o3_lambdas:
+            for pair_i, (block_1, block_2) in enumerate(pairs_blocks):
+                if (
+                    pairs_o3_lambda[pair_i] != o3_lambda
+                    or pairs_center_type[pair_i] != center_type
+                ):
+                    continue
+
+                values_1 = block_1.values
+                values_2 = block_2.values
+                if first_values is None:
+                    first_values = values_1
+                elif values_1.shape[0] != first_values.shape[0]:
+                    can_merge = False
+
+                if values_1.dtype != values_2.dtype:
+                    can_merge = False
+
+                values_offsets[pair_i] = n_properties
+                n_properties += values_1.shape[2] * values_2.shape[2]
+
+        if first_values is not None and can_merge:
+            merged_values.append(
+                _dispatch.empty_like(
+                    first_values, shape=[first_values.shape[0], n_properties]
+                )
+            )
+        else:
+            merged_values.append(None)
+
+    return merged_values, values_offsets
+
+
+def _l_to_properties(
+    keys: Labels, blocks: List[TensorBlock], merged_values: List[Optional[Array]]
+) -> TensorMap:
+    """
+    Move the ``"l"`` dimension of the keys to the properties. This gives the same
+    result as ``TensorMap(keys, blocks).keys_to_properties("l")``.
+
+    When all the blocks for a given center type share the same sorted samples and
+    gradients samples (which is the usual case), the blocks are directly concatenated
+    along the properties, without going through the more general (and slower) merging
+    of samples in ``keys_to_properties``. ``merged_values`` contains, for each center
+    type in order of first appearance, either ``None`` or an array already containing
+    the values of the corresponding blocks, created by ``_allocate_merged_values``.
+    """
+    all_o3_lambda = _dispatch.to_int_list(keys.column("l"))
+    all_center_types = _dispatch.to_int_list(keys.column("center_type"))
+
+    o3_lambdas = _unique_in_order(all_o3_lambda)
+    center_types = _unique_in_order(all_center_types)
+
+    new_blocks: List[TensorBlock] = []
+    for center_i, center_type in enumerate(center_types):
+        blocks_to_merge: List[TensorBlock] = []
+        for o3_lambda in o3_lambdas:
+            n_matching = 0
+            for i, block in enumerate(blocks):
+                if all_o3_lambda[i] == o3_lambda and all_center_types[i] == center_type:
+                    blocks_to_merge.append(block)
+                    n_matching += 1
+
+            if n_matching != 1:
+                return TensorMap(keys, blocks).keys_to_properties("l")
+
+        if not _can_concatenate(blocks_to_merge):
+            return TensorMap(keys, blocks).keys_to_properties("l")
+
+        new_blocks.append(
+            _concatenate_properties(
+                blocks_to_merge, o3_lambdas, merged_values[center_i]
+            )
+        )
+
+    new_keys = Labels(
+        names=["center_type"],
+        values=_dispatch.list_to_array(
+            array=keys.values, data=[[center_type] for center_type in center_types]
+        ),
+    )
+
+    return TensorMap(new_keys, new_blocks)
+
+
+def _can_concatenate(blocks: List[TensorBlock]) -> bool:
+    """Check that all ``blocks`` have the same sorted samples and gradients samples"""
+    first = blocks[0]
+    if not _is_sorted(first.samples):
+        return False
+
+    for parameter in first.gradients_list():
+        if not _is_sorted(first.gradient(parameter).samples):
+            return False
+
+    for block in blocks[1:]:
+        if not block.samples == first.samples:
+            return False
+
+        if block.gradients_list() != first.gradients_list():
+            return False
+
+        for parameter in first.gradients_list():
+            samples = block.gradient(parameter).samples
+            if not samples == first.gradient(parameter).samples:
+                return False
+
+    return True
+
+
+def _is_sorted(labels: Labels) -> bool:
+    """Check if the entries of ``labels`` are sorted in lexicographic order"""
+    if len(labels) < 2:
+        return True
+
+    # entries are sorted if the first non-zero element of the difference between
+    # consecutive entries is positive
+    diff = labels.values[1:] - labels.values[:-1]
+    greater = diff[:, 0] > 0
+    equal = diff[:, 0] == 0
+    for i in range(1, diff.shape[1]):
+        greater = greater | (equal & (diff[:, i] > 0))
+        equal = equal & (diff[:, i] == 0)
+
+    return bool(_dispatch.all(greater))
+
+
+def _concatenate_properties(
+    blocks: List[TensorBlock], o3_lambdas: List[int], merged_values: Optional[Array]
+) -> TensorBlock:
+    """
+    Concatenate ``blocks`` (which must have the same samples) along the properties,
+    adding an ``"l"`` dimension to the properties. If ``merged_values`` is not
+    ``None``, it must already contain the concatenated values of all blocks.
+    """
+    first = blocks[0]
+
+    properties_values = []
+    for block, o3_lambda in zip(blocks, o3_lambdas):
+        values = block.properties.values
+        o3_lambda_column = (
+            _dispatch.zeros_like(values, shape=[values.shape[0], 1]) + o3_lambda
+        )
+        properties_values.append(
+            _dispatch.concatenate([o3_lambda_column, values], axis=1)
+        )
+
+    properties = Labels(
+        names=["l"] + first.properties.names,
+        values=_dispatch.concatenate(properties_values, axis=0),
+    )
+
+    if merged_values is None:
+        merged_values = _dispatch.concatenate(
+            [block.values for block in blocks], axis=1
+        )
+
+    new_block = TensorBlock(
+        values=merged_values,
+        samples=first.samples,
+        components=[],
+        properties=properties,
+    )
+
+    for parameter in first.gradients_list():
+        gradient = first.gradient(parameter)
+        new_block.add_gradient(
+            parameter,
+            TensorBlock(
+                values=_dispatch.concatenate(
+                    [block.gradient(parameter).values for block in blocks], axis=2
+                ),
+                samples=gradient.samples,
+                components=gradient.components,
+                properties=properties,
+            ),
+        )
+
+    return new_block
+
+
 def _positions_gradients(
-    new_block: TensorBlock, block_1: TensorBlock, block_2: TensorBlock, factor: float
+    new_block: TensorBlock,
+    block_1: TensorBlock,
+    block_2: TensorBlock,
+    factor: float,
+    symmetric: bool,
 ):
+    """
+    Add the gradients with respect to positions to ``new_block``, computed from the
+    gradients of ``block_1`` and ``block_2``. ``symmetric`` should be ``True`` if
+    ``block_1`` and ``block_2`` are the same block.
+    """
     gradient_1 = block_1.gradient("positions")
     gradient_2 = block_2.gradient("positions")
 
-    if len(gradient_1.samples) == 0 or len(gradient_2.samples) == 0:
-        gradients_samples = Labels.empty(["sample", "system", "atom"])
-        gradient_values = _dispatch.list_to_array(
-            array=gradient_1.values, data=[]
-        ).reshape(0, 1, len(new_block.properties))
+    n_grad_samples_1 = gradient_1.values.shape[0]
+    n_grad_samples_2 = gradient_2.values.shape[0]
+    if n_grad_samples_1 == 0 and n_grad_samples_2 == 0:
+        # if only one of the gradients is empty, the other one still contributes to
+        # the power spectrum gradients, and is handled by the code below
+        gradients_samples = gradient_1.samples
+        gradient_values = _dispatch.empty_like(
+            array=gradient_1.values, shape=[0, 3, len(new_block.properties)]
+        )
+    elif symmetric:
+        # when block_1 and block_2 are the same, the gradient samples are the same
+        # for both, and the second contribution (ima, ixmb -> ixab) is the first one
+        # (ixma, imb -> ixab) with a and b exchanged. We only compute the first one.
+        gradients_samples = gradient_1.samples
+
+        sample_indices = _dispatch.to_index_array(gradients_samples.column("sample"))
+        block_values = (factor * block_1.values)[sample_indices]
+        new_shape = block_values.shape[:1] + (1,) + block_values.shape[1:]
+
+        gradient_values = _dispatch.matmul(
+            gradient_1.values.swapaxes(2, 3),
+            block_values.reshape(new_shape),
+        )
+        gradient_values = gradient_values + gradient_values.swapaxes(2, 3)
+        gradient_values = gradient_values.reshape(
+            gradient_values.shape[0], 3, len(new_block.properties)
+        )
     else:
         # The "sample" dimension in the power spectrum gradient samples do
         # not necessarily matches the "sample" dimension in the spherical
         # expansion gradient samples. We create new samples by creating a
-        # union between the two gradient samples.
-        (
-            gradients_samples,
-            grad1_sample_idxs,
-            grad2_sample_idxs,
-        ) = gradient_1.samples.union_and_mapping(gradient_2.samples)
-
-        gradient_values = _dispatch.zeros_like(
+        # union between the two gradient samples. The union starts with all the
+        # gradient samples of block_1, in the same order.
+        gradients_samples, _, grad2_sample_idxs = gradient_1.samples.union_and_mapping(
+            gradient_2.samples
+        )
+
+        gradient_values = _dispatch.empty_like(
             array=gradient_1.values,
             shape=[gradients_samples.values.shape[0], 3, len(new_block.properties)],
         )
-
-        # the operation below is equivalent to an einsum with: ixma, imb -> ixab
+        # only the gradient samples which are not in block_1 need to be initialized,
+        # the others are directly overwritten below
+        gradient_values[n_grad_samples_1:] = 0.0
+
+        # the operation below is equivalent to an einsum with: ixma, imb -> ixab. The
+        # factor is applied to the values of block_2 before gathering them for each
+        # gradient sample, rather than to the gathered values or to the output of the
+        # matmul, since these are larger.
         sample_indices_1 = _dispatch.to_index_array(gradient_1.samples.column("sample"))
-        block_2_values = block_2.values[sample_indices_1]
-        new_shape = block_2_values.shape[:1] + (-1,) + block_2_values.shape[1:]
+        block_2_values = (factor * block_2.values)[sample_indices_1]
+        new_shape = block_2_values.shape[:1] + (1,) + block_2_values.shape[1:]
 
-        gradient_1_values = factor * _dispatch.matmul(
+        # the result is written directly in the first gradient samples
+        _dispatch.matmul(
             gradient_1.values.swapaxes(2, 3),
             block_2_values.reshape(new_shape),
-        )
-
-        gradient_values[grad1_sample_idxs] += gradient_1_values.reshape(
-            gradient_1.samples.values.shape[0], 3, -1
+            out=gradient_values[:n_grad_samples_1].reshape(
+                n_grad_samples_1,
+                3,
+                gradient_1.values.shape[3],
+                block_2_values.shape[2],
+            ),
         )
 
         # the operation below is equivalent to an einsum with: ima, ixmb -> ixab
         sample_indices_2 = _dispatch.to_index_array(gradient_2.samples.column("sample"))
-        block_1_values = block_1.values[sample_indices_2]
-        new_shape = block_1_values.shape[:1] + (-1,) + block_1_values.shape[1:]
+        block_1_values = (factor * block_1.values)[sample_indices_2]
+        new_shape = block_1_values.shape[:1] + (1,) + block_1_values.shape[1:]
 
-        gradient_values_2 = factor * _dispatch.matmul(
+        gradient_values_2 = _dispatch.matmul(
             block_1_values.reshape(new_shape).swapaxes(2, 3),
             gradient_2.values,
         )
 
         gradient_values[grad2_sample_idxs] += gradient_values_2.reshape(
-            gradient_2.samples.values.shape[0], 3, -1
+            n_grad_samples_2, 3, len(new_block.properties)
         )
 
     gradient = TensorBlock(
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from featomic.density import Gaussian, SmearedPowerLaw
+from featomic.density import Gaussian, SmearedPowerLaw, Willatt2018
 
 
 pytest.importorskip("scipy")
@@ -18,3 +18,63 @@ def test_derivative(density):
     numerical_grad = np.gradient(rho, positions)
 
     np.testing.assert_allclose(numerical_grad, analytical_grad, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "exponent, rate, scale", [(1, 1.0, 1.5), (3, 0.5, 2.0), (7, 2.0, 1.0)]
+)
+def test_willatt2018(exponent, rate, scale):
+    scaling = Willatt2018(exponent=exponent, rate=rate, scale=scale)
+    positions = np.linspace(0.1, 5, num=int(1e6))
+
+    # same expressions as the native implementation
+    rs = positions / scale
+    expected = rate / (rate + rs**exponent)
+    expected_grad = -rate * exponent / scale * rs ** (exponent - 1)
+    expected_grad /= (rate + rs**exponent) ** 2
+
+    values = scaling.compute(positions, derivative=False)
+    np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+    analytical_grad = scaling.compute(positions, derivative=True)
+    np.testing.assert_allclose(analytical_grad, expected_grad, rtol=1e-12)
+
+    numerical_grad = np.gradient(values, positions, edge_order=2)
+    np.testing.assert_allclose(numerical_grad, analytical_grad, atol=1e-6)
+
+
+def test_gaussian_update_width():
+    positions = np.linspace(0, 5, num=100)
+
+    density = Gaussian(width=1.2)
+    density.compute(positions, derivative=False)
+    density.width = 0.7
+
+    reference = Gaussian(width=0.7)
+    for derivative in [False, True]:
+        np.testing.assert_equal(
+            density.compute(positions, derivative=derivative),
+            reference.compute(positions, derivative=derivative),
+        )
+
+
+@pytest.mark.parametrize("exponent", [0, 1, 3])
+def test_smeared_power_law_update_hypers(exponent):
+    positions = np.linspace(0, 5, num=100)
+
+    density = SmearedPowerLaw(smearing=1.2, exponent=2)
+    density.compute(positions, derivative=False)
+    density.smearing = 0.7
+    density.exponent = exponent
+
+    reference = SmearedPowerLaw(smearing=0.7, exponent=exponent)
+    for derivative in [False, True]:
+        np.testing.assert_equal(
+            density.compute(positions, derivative=derivative),
+            reference.compute(positions, derivative=derivative),
+        )
+        # scalar inputs
+        np.testing.assert_equal(
+            density.compute(positions[10], derivative=derivative),
+            reference.compute(positions[10], derivative=derivative),
+        )
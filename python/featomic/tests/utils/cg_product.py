@@ -431,3 +431,32 @@ def test_device_dtype(dtype, device):
         o3_lambda_1_new_name="l_1",
         o3_lambda_2_new_name="l_2",
     )
+
+
+def test_mixed_dtypes():
+    """
+    Tests that calling compute with a lower precision input does not change the
+    results of later calls with double precision inputs.
+    """
+    frames = h2o_isolated()
+    density = spherical_expansion(frames)
+    density_1 = metatensor.rename_dimension(density, "properties", "n", "n_1")
+    density_2 = metatensor.rename_dimension(density, "properties", "n", "n_2")
+
+    calculator = ClebschGordanProduct(max_angular=MAX_ANGULAR * 2)
+
+    reference = calculator.compute(
+        density_1, density_2, o3_lambda_1_new_name="l_1", o3_lambda_2_new_name="l_2"
+    )
+
+    calculator.compute(
+        density_1.to(dtype=np.float32),
+        density_2.to(dtype=np.float32),
+        o3_lambda_1_new_name="l_1",
+        o3_lambda_2_new_name="l_2",
+    )
+
+    nu_2 = calculator.compute(
+        density_1, density_2, o3_lambda_1_new_name="l_1", o3_lambda_2_new_name="l_2"
+    )
+    assert metatensor.equal(nu_2, reference)
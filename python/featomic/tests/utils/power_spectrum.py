@@ -2,10 +2,12 @@ import copy
 
 import numpy as np
 import pytest
+from metatensor import Labels, TensorBlock
 from numpy.testing import assert_allclose, assert_equal
 
 import featomic
 from featomic.utils import PowerSpectrum
+from featomic.utils.power_spectrum import _positions_gradients
 
 from ..test_systems import SystemForTests
 from .test_utils import finite_differences_positions
@@ -163,6 +165,119 @@ def test_power_spectrum_gradients() -> None:
     finite_differences_positions(calculator, atoms)
 
 
+def test_power_spectrum_empty_gradients() -> None:
+    """Test gradients for atoms without any neighbor."""
+    frames = [
+        ase.Atoms("H", positions=np.zeros([1, 3])),
+        ase.Atoms("O", positions=np.zeros([1, 3])),
+    ]
+
+    for calculator_2 in [None, soap_spx()]:
+        calculator = PowerSpectrum(calculator_1=soap_spx(), calculator_2=calculator_2)
+        descriptor = calculator.compute(frames, gradients=["positions"])
+
+        for block in descriptor.blocks():
+            gradient = block.gradient("positions")
+            assert gradient.values.shape[1:] == (3, len(block.properties))
+
+
+@pytest.mark.parametrize("short_cutoff_first", [True, False])
+def test_power_spectrum_gradients_without_neighbors(short_cutoff_first) -> None:
+    """Test gradients when only one of the spherical expansions has neighbors."""
+    hypers_short = copy.deepcopy(SOAP_HYPERS)
+    hypers_short["cutoff"] = {
+        "radius": 0.5,
+        "smoothing": {"type": "ShiftedCosine", "width": 0.1},
+    }
+
+    calculators = [soap_spx(), featomic.SphericalExpansion(**hypers_short)]
+    if short_cutoff_first:
+        calculators = calculators[::-1]
+    calculator = PowerSpectrum(*calculators)
+
+    atoms = ase.Atoms(
+        symbols="HHOO",
+        positions=[[0, 0, 0], [0, 0, 1], [0, 0, 2], [0, 0, 3]],
+        pbc=True,
+        cell=[[10, 0, 0], [0, 10, 0], [0, 0, 10]],
+    )
+
+    # all atoms are neighbors with the long cutoff, so the gradients should contain
+    # all the atoms, even if there are no neighbors with the short cutoff
+    descriptor = calculator.compute(atoms, gradients=["positions"])
+    for block in descriptor.blocks():
+        gradient = block.gradient("positions")
+        assert len(gradient.samples) == len(block.samples) * len(atoms)
+        assert np.any(gradient.values != 0)
+
+    finite_differences_positions(calculator, atoms)
+
+
+@pytest.mark.parametrize("empty", [1, 2])
+def test_positions_gradients_one_empty(empty) -> None:
+    """Test power spectrum gradients when one of the input gradients is empty."""
+    rng = np.random.default_rng(0)
+    samples = Labels(["system", "atom"], np.array([[0, 0], [0, 1], [0, 2]]))
+    gradient_samples = Labels(
+        ["sample", "system", "atom"],
+        np.array([[0, 0, 0], [0, 0, 1], [1, 0, 1], [2, 0, 0], [2, 0, 2]]),
+    )
+
+    def create_block(n_properties, with_gradients):
+        block = TensorBlock(
+            values=rng.normal(size=(len(samples), 3, n_properties)),
+            samples=samples,
+            components=[Labels.range("o3_mu", 3)],
+            properties=Labels.range("n", n_properties),
+        )
+
+        if with_gradients:
+            grad_samples = gradient_samples
+        else:
+            grad_samples = Labels.empty(["sample", "system", "atom"])
+
+        block.add_gradient(
+            "positions",
+            TensorBlock(
+                values=rng.normal(size=(len(grad_samples), 3, 3, n_properties)),
+                samples=grad_samples,
+                components=[Labels.range("xyz", 3), Labels.range("o3_mu", 3)],
+                properties=block.properties,
+            ),
+        )
+        return block
+
+    block_1 = create_block(4, with_gradients=empty != 1)
+    block_2 = create_block(5, with_gradients=empty != 2)
+
+    new_block = TensorBlock(
+        values=np.zeros((len(samples), 4 * 5)),
+        samples=samples,
+        components=[],
+        properties=Labels.range("property", 4 * 5),
+    )
+    factor = 0.5
+    _positions_gradients(new_block, block_1, block_2, factor, symmetric=False)
+
+    # the non-empty gradient should still contribute to the power spectrum gradients
+    sample_indices = gradient_samples.column("sample")
+    if empty == 1:
+        gradient_2 = block_2.gradient("positions")
+        expected = np.einsum(
+            "ima,ixmb->ixab", block_1.values[sample_indices], gradient_2.values
+        )
+    else:
+        gradient_1 = block_1.gradient("positions")
+        expected = np.einsum(
+            "ixma,imb->ixab", gradient_1.values, block_2.values[sample_indices]
+        )
+    expected = factor * expected.reshape(len(gradient_samples), 3, 4 * 5)
+
+    gradient = new_block.gradient("positions")
+    assert gradient.samples == gradient_samples
+    assert_allclose(gradient.values, expected)
+
+
 def test_power_spectrum_unknown_gradient() -> None:
     """Test error raise if an unknown gradient is present."""
 